@@ -0,0 +1,505 @@
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Python Demo: A Compact Binary Codec for the Core Data Types
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# Usage:
+#   python Python/demos/Ch1BinaryCodec.py            # round-trip checks + benchmark
+#
+# The cheat sheet covers int, float, complex, str, bool, None, tuple, list, set, dict, bytes and
+# bytearray. This demo serializes exactly that set of types to a small, schema-less binary format:
+# - ints are zigzag varints (small numbers take 1 byte, big ints still work: Python ints are unbounded),
+# - floats are raw 8-byte IEEE 754 doubles, complex numbers are two doubles,
+# - str, bytes and bytearray are a varint length followed by the raw payload,
+# - strings repeated within one message are written once and then referenced by index,
+# - tuple, list and set are a varint count followed by the items; dict is a count followed by key/value pairs.
+#
+# Decoding works directly on a memoryview, so bytes payloads can be returned as memoryview slices
+# of the input buffer (zero-copy) instead of new bytes objects.
+#
+# Pitfall: This is a pure-Python codec. Its output is about 10% smaller than pickle's on record-shaped
+# data, but encoding and decoding are roughly 10x slower than pickle (and slower than json); see the
+# benchmark at the end. It is not a drop-in replacement for pickle on a hot path.
+
+import io
+import struct
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+#===============================================================================
+# 1. Wire Format
+#===============================================================================
+
+# One tag byte per value. True and False get their own tags, so a flag costs a single byte.
+TAG_NONE = 0x00
+TAG_FALSE = 0x01
+TAG_TRUE = 0x02
+TAG_INT = 0x03
+TAG_FLOAT = 0x04
+TAG_COMPLEX = 0x05
+TAG_STR = 0x06
+TAG_BYTES = 0x07
+TAG_BYTEARRAY = 0x08
+TAG_TUPLE = 0x09
+TAG_LIST = 0x0A
+TAG_SET = 0x0B
+TAG_DICT = 0x0C
+TAG_STR_REF = 0x0D  # Back-reference to a string already written in the same message.
+
+MAX_SHARED_STR = 64  # Only strings up to this many UTF-8 bytes are shared; longer ones are rarely repeated.
+
+# '<' means little-endian with no padding, so the layout is identical on every platform.
+DOUBLE = struct.Struct("<d")
+COMPLEX = struct.Struct("<dd")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+#===============================================================================
+# 2. Varints
+#===============================================================================
+
+# A varint stores 7 bits per byte; the high bit says "more bytes follow".
+# Zigzag maps signed to unsigned so that small negative numbers stay short:
+#   0 -> 0, -1 -> 1, 1 -> 2, -2 -> 3, ...
+# Insight: The usual zigzag trick (n << 1) ^ (n >> 63) assumes 64-bit ints. Python ints are
+# arbitrary precision, so the branch below is used instead and works for any size.
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(view: memoryview, pos: int) -> Tuple[int, int]:
+    # Returns (value, new_position).
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = view[pos]
+        except IndexError:
+            raise ValueError("truncated varint") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+#===============================================================================
+# 3. Encoding
+#===============================================================================
+
+# Dispatch on the exact type first: it is one dict lookup instead of a chain of isinstance() calls.
+# Pitfall: bool is a subclass of int (see section 1 of the cheat sheet), so an isinstance(value, int)
+# check would encode True as the integer 1. Exact-type dispatch keeps them apart.
+#
+# Repeated strings: records usually repeat the same dict keys ("username", "age", ...). The first
+# time a short string is written it gets the next index in a per-message table; later occurrences
+# are written as TAG_STR_REF plus that index, which is usually 2 bytes. pickle and marshal do the
+# same kind of memoization, which is why they are small on record-shaped data.
+
+
+class Encoder:
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self.strings: Dict[str, int] = {}
+
+    def encode(self, value: Any) -> None:
+        encoder = _ENCODERS.get(type(value))
+        if encoder is None:
+            # Subclasses (e.g. an IntEnum or a namedtuple) are encoded as their base type.
+            # The type itself is not recorded, so they decode as the plain built-in.
+            for base, to_base in _BASE_CONVERSIONS:
+                if isinstance(value, base):
+                    self.encode(to_base(value))
+                    return
+            raise TypeError(f"cannot encode object of type {type(value).__name__!r}")
+        encoder(self, value)
+
+    def _none(self, value: None) -> None:
+        self.out.append(TAG_NONE)
+
+    def _bool(self, value: bool) -> None:
+        self.out.append(TAG_TRUE if value else TAG_FALSE)
+
+    def _int(self, value: int) -> None:
+        self.out.append(TAG_INT)
+        write_varint(self.out, zigzag(value))
+
+    def _float(self, value: float) -> None:
+        self.out.append(TAG_FLOAT)
+        self.out += DOUBLE.pack(value)
+
+    def _complex(self, value: complex) -> None:
+        self.out.append(TAG_COMPLEX)
+        self.out += COMPLEX.pack(value.real, value.imag)
+
+    def _str(self, value: str) -> None:
+        out = self.out
+        index = self.strings.get(value)
+        if index is not None:
+            out.append(TAG_STR_REF)
+            write_varint(out, index)
+            return
+        data = value.encode("utf-8")
+        if len(data) <= MAX_SHARED_STR:
+            self.strings[value] = len(self.strings)
+        out.append(TAG_STR)
+        write_varint(out, len(data))
+        out += data
+
+    def _bytes(self, value: Buffer) -> None:
+        out = self.out
+        out.append(TAG_BYTEARRAY if type(value) is bytearray else TAG_BYTES)
+        write_varint(out, len(value))
+        out += value
+
+    def _sequence(self, value: Union[tuple, list, set]) -> None:
+        self.out.append(_SEQUENCE_TAGS[type(value)])
+        write_varint(self.out, len(value))
+        for item in value:
+            self.encode(item)
+
+    def _dict(self, value: dict) -> None:
+        self.out.append(TAG_DICT)
+        write_varint(self.out, len(value))
+        for key, item in value.items():
+            self.encode(key)
+            self.encode(item)
+
+
+_SEQUENCE_TAGS = {tuple: TAG_TUPLE, list: TAG_LIST, set: TAG_SET}
+
+_ENCODERS = {
+    type(None): Encoder._none,
+    bool: Encoder._bool,
+    int: Encoder._int,
+    float: Encoder._float,
+    complex: Encoder._complex,
+    str: Encoder._str,
+    bytes: Encoder._bytes,
+    bytearray: Encoder._bytes,
+    tuple: Encoder._sequence,
+    list: Encoder._sequence,
+    set: Encoder._sequence,
+    dict: Encoder._dict,
+}
+
+# How a subclass instance becomes its plain base type. Calling base(value) is not safe: str(value)
+# calls the subclass's own __str__, so a str-mixin Enum member would be written as 'Color.RED'
+# instead of its value 'red'. The base type's own methods (and the buffer protocol for bytes) read
+# the stored value and ignore overrides. bool cannot be subclassed, so it is not listed.
+_BASE_CONVERSIONS: Tuple[Tuple[type, Callable[[Any], Any]], ...] = (
+    (int, int.__index__),
+    (float, float.__float__),
+    (complex, lambda value: complex(complex.real.__get__(value), complex.imag.__get__(value))),
+    (str, str.__str__),
+    (bytes, lambda value: bytes(memoryview(value))),
+    (bytearray, lambda value: bytearray(memoryview(value))),
+    (tuple, lambda value: tuple(tuple.__iter__(value))),
+    (list, lambda value: list(list.__iter__(value))),
+    (set, lambda value: set(set.__iter__(value))),
+    (dict, lambda value: dict(dict.items(value))),
+)
+
+
+def encode(value: Any) -> bytes:
+    encoder = Encoder()
+    encoder.encode(value)
+    return bytes(encoder.out)
+
+
+#===============================================================================
+# 4. Decoding from a memoryview
+#===============================================================================
+
+# Every decode step takes (view, pos) and returns (value, new_pos); no intermediate bytes objects
+# are created while walking the buffer.
+# Zero-copy: with zero_copy=True, bytes values come back as memoryview slices that point into the
+# input buffer. They stay valid only as long as that buffer is alive and unchanged.
+# Advanced Tip: Call bytes(view_slice) on the few payloads you need to keep after the buffer goes away.
+# Pitfall: Dict keys and set members are always decoded as real bytes, even with zero_copy=True. A
+# memoryview key would hash like bytes but stay tied to the buffer, and a writable one (from a
+# bytearray input) cannot be hashed at all. The view itself is made read-only for the same reason.
+# Note: str values are always new objects; UTF-8 has to be decoded into Python's internal representation.
+
+
+class Decoder:
+    def __init__(self, data: Buffer, zero_copy: bool = False) -> None:
+        self.view = memoryview(data).cast("B").toreadonly()
+        self.zero_copy = zero_copy
+        self.strings: List[str] = []  # Mirrors Encoder.strings: index -> string.
+
+    def decode(self, pos: int = 0, as_key: bool = False) -> Tuple[Any, int]:
+        # 'as_key' is True while decoding a dict key or set member (and anything nested in one),
+        # where bytes payloads must be copied even in zero-copy mode.
+        view = self.view
+        try:
+            tag = view[pos]
+        except IndexError:
+            raise ValueError("truncated input: expected a tag byte") from None
+        pos += 1
+
+        if tag == TAG_INT:
+            raw, pos = read_varint(view, pos)
+            return unzigzag(raw), pos
+        if tag == TAG_STR:
+            payload, pos = self._payload(pos)
+            value = str(payload, "utf-8")
+            if len(payload) <= MAX_SHARED_STR:
+                self.strings.append(value)
+            return value, pos
+        if tag == TAG_STR_REF:
+            index, pos = read_varint(view, pos)
+            try:
+                return self.strings[index], pos
+            except IndexError:
+                raise ValueError(f"string reference {index} at offset {pos} is not defined yet") from None
+        if tag == TAG_NONE:
+            return None, pos
+        if tag == TAG_TRUE:
+            return True, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        if tag == TAG_FLOAT:
+            self._need(pos, DOUBLE.size)
+            return DOUBLE.unpack_from(view, pos)[0], pos + DOUBLE.size
+        if tag == TAG_COMPLEX:
+            self._need(pos, COMPLEX.size)
+            real, imag = COMPLEX.unpack_from(view, pos)
+            return complex(real, imag), pos + COMPLEX.size
+        if tag == TAG_BYTES:
+            payload, pos = self._payload(pos)
+            return (payload if self.zero_copy and not as_key else payload.tobytes()), pos
+        if tag == TAG_BYTEARRAY:
+            # bytearray is mutable, so it always gets its own copy.
+            payload, pos = self._payload(pos)
+            return bytearray(payload), pos
+        if tag in (TAG_LIST, TAG_TUPLE, TAG_SET):
+            count, pos = read_varint(view, pos)
+            items = []
+            append = items.append
+            item_as_key = as_key or tag == TAG_SET
+            for _ in range(count):
+                item, pos = self.decode(pos, item_as_key)
+                append(item)
+            if tag == TAG_TUPLE:
+                return tuple(items), pos
+            if tag == TAG_SET:
+                return set(items), pos
+            return items, pos
+        if tag == TAG_DICT:
+            count, pos = read_varint(view, pos)
+            result = {}
+            for _ in range(count):
+                key, pos = self.decode(pos, True)
+                result[key], pos = self.decode(pos, as_key)
+            return result, pos
+        raise ValueError(f"unknown tag 0x{tag:02x} at offset {pos - 1}")
+
+    def _payload(self, pos: int) -> Tuple[memoryview, int]:
+        length, pos = read_varint(self.view, pos)
+        self._need(pos, length)
+        return self.view[pos:pos + length], pos + length
+
+    def _need(self, pos: int, size: int) -> None:
+        if pos + size > len(self.view):
+            raise ValueError(f"truncated input: need {size} bytes at offset {pos}")
+
+
+def decode(data: Buffer, zero_copy: bool = False) -> Any:
+    value, pos = Decoder(data, zero_copy).decode()
+    if pos != len(memoryview(data).cast("B")):
+        raise ValueError(f"trailing data after offset {pos}")
+    return value
+
+
+#===============================================================================
+# 5. Streaming Large Lists
+#===============================================================================
+
+# A huge list does not need to be built (or held) in memory as one blob. dump_stream() writes each
+# item as a length-prefixed record, flushing to the file whenever the buffer grows past
+# 'chunk_size'; load_stream() yields the items back one at a time.
+# Insight: The length prefix lets the reader pull exactly one record with a single read() call,
+# and makes it possible to skip records without decoding them.
+
+
+def dump_stream(items: Iterable[Any], fp: BinaryIO, chunk_size: int = 1 << 16) -> int:
+    # Returns the number of records written.
+    out = bytearray()
+    count = 0
+    for item in items:
+        # Each record gets a fresh Encoder, so string references never cross record boundaries
+        # and any record can be decoded on its own.
+        encoder = Encoder()
+        encoder.encode(item)
+        write_varint(out, len(encoder.out))
+        out += encoder.out
+        count += 1
+        if len(out) >= chunk_size:
+            fp.write(out)
+            out.clear()
+    if out:
+        fp.write(out)
+    return count
+
+
+def _read_stream_varint(fp: BinaryIO) -> Union[int, None]:
+    # Like read_varint, but pulls bytes from a file; returns None at a clean end of stream.
+    result = 0
+    shift = 0
+    while True:
+        byte = fp.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("truncated record length")
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def load_stream(fp: BinaryIO, zero_copy: bool = False) -> Iterator[Any]:
+    # Wrap unbuffered files so the one-byte length reads above do not turn into system calls.
+    if not isinstance(fp, (io.BufferedIOBase, io.BytesIO)):
+        fp = io.BufferedReader(fp)
+    while True:
+        length = _read_stream_varint(fp)
+        if length is None:
+            return
+        record = fp.read(length)
+        if len(record) != length:
+            raise ValueError("truncated record")
+        yield decode(record, zero_copy)
+
+
+#===============================================================================
+# 6. Round-Trip Checks and Benchmark
+#===============================================================================
+
+
+def _sample_payload(rows: int) -> List[dict]:
+    # Mirrors the kinds of values used in the cheat sheet: user records with mixed types.
+    return [
+        {
+            "username": f"user{i}",
+            "age": 20 + i % 50,
+            "active": i % 3 != 0,
+            "score": i * 0.5,
+            "tags": ["python", "data", "types"],
+            "manager": None,
+        }
+        for i in range(rows)
+    ]
+
+
+def _check_round_trips() -> None:
+    values = [
+        None, True, False, 0, 1, -1, 127, 128, -129, 2 ** 200, -(2 ** 200),
+        3.14159, float("inf"), -0.0, 2 + 3j, "", "Hello, Python!", "héllo ✨",
+        b"", b"hello", bytearray(b"hello"), (1, 2, 3), [1, [2, [3]]], {1, 2, 3},
+        {"name": "Sabbir", "age": 30, (1, 2): {"nested": [b"x", 1.5]}},
+    ]
+    for value in values:
+        decoded = decode(encode(value))
+        assert decoded == value and type(decoded) is type(value), (value, decoded)
+
+    # bool and int stay distinct even though True == 1.
+    assert decode(encode([True, 1])) == [True, 1] and type(decode(encode(True))) is bool
+
+    # Subclasses decode as their base type with the stored value, not the result of their __str__.
+    from collections import OrderedDict
+    from enum import Enum, IntEnum
+
+    class Color(str, Enum):
+        RED = "red"
+
+    class Level(IntEnum):
+        HIGH = 3
+
+    decoded = decode(encode({Color.RED: [Level.HIGH], "od": OrderedDict(a=Color.RED)}))
+    assert decoded == {"red": [3], "od": {"a": "red"}}, decoded
+    assert type(next(iter(decoded))) is str and type(decoded["red"][0]) is int
+
+    # Zero-copy: the decoded bytes value is a view into the encoded buffer.
+    blob = encode({"payload": b"x" * 1000})
+    view = decode(blob, zero_copy=True)["payload"]
+    assert isinstance(view, memoryview) and view.obj is blob and view == b"x" * 1000
+
+    # ...except for dict keys and set members (also inside tuple keys), which are copied to bytes,
+    # including when the input buffer is a writable bytearray.
+    nested = {b"k": b"v", (b"t", 1): {b"s"}}
+    for buffer in (encode(nested), bytearray(encode(nested))):
+        decoded = decode(buffer, zero_copy=True)
+        assert decoded == nested and isinstance(decoded[b"k"], memoryview)
+        keys = [key for key in decoded] + [decoded[(b"t", 1)].pop()]
+        assert type(keys[0]) is bytes and type(keys[1][0]) is bytes and type(keys[2]) is bytes
+
+    # Streaming
+    stream = io.BytesIO()
+    assert dump_stream(range(10_000), stream, chunk_size=1024) == 10_000
+    stream.seek(0)
+    assert list(load_stream(stream)) == list(range(10_000))
+
+    try:
+        encode(object())
+    except TypeError as e:
+        print(f"Unsupported type rejected: {e}")
+    try:
+        decode(encode("truncated")[:-1])
+    except ValueError as e:
+        print(f"Malformed input rejected: {e}")
+    print("Round-trip checks passed.")
+
+
+def _benchmark(rows: int = 20_000, number: int = 5) -> None:
+    import json
+    import marshal
+    import pickle
+    import timeit
+
+    payload = _sample_payload(rows)
+    codecs = {
+        "Ch1BinaryCodec": (encode, decode),
+        "pickle (protocol 5)": (lambda v: pickle.dumps(v, protocol=5), pickle.loads),
+        "marshal": (marshal.dumps, marshal.loads),
+        "json": (lambda v: json.dumps(v, separators=(",", ":")).encode("utf-8"), json.loads),
+    }
+    # Note: The payload sticks to types json supports. json has no complex, bytes, set or tuple,
+    # so for the full type set the comparison is only against pickle and marshal.
+    print(f"\nBenchmark: {rows} user records, best of {number} runs")
+    print(f"{'Codec':<22} {'Size (bytes)':>13} {'Encode (ms)':>12} {'Decode (ms)':>12}")
+    results = {}
+    for name, (dumps, loads) in codecs.items():
+        blob = dumps(payload)
+        assert loads(blob) == payload
+        encode_time = min(timeit.repeat(lambda: dumps(payload), number=1, repeat=number))
+        decode_time = min(timeit.repeat(lambda: loads(blob), number=1, repeat=number))
+        results[name] = (len(blob), encode_time, decode_time)
+        print(f"{name:<22} {len(blob):>13} {encode_time * 1000:>12.2f} {decode_time * 1000:>12.2f}")
+    size, encode_time, decode_time = results["Ch1BinaryCodec"]
+    pickle_size, pickle_encode, pickle_decode = results["pickle (protocol 5)"]
+    print(f"Ch1BinaryCodec: {1 - size / pickle_size:.0%} smaller than pickle, but encode {encode_time / pickle_encode:.1f}x "
+          f"and decode {decode_time / pickle_decode:.1f}x slower")
+    # Pitfall: Do NOT use this codec to speed up a serialization hotspot. It is pure Python, and
+    # pickle, marshal and json are C extensions: on this payload it encodes and decodes roughly 10x
+    # slower than pickle and is slower than json too, for a size win of about 10% over pickle.
+    # It is only worth it when bytes on the wire or on disk cost more than CPU time, or for zero-copy
+    # access to large bytes payloads. A C or Cython port of this exact format would be needed before it
+    # could compete on speed.
+
+if __name__ == "__main__":
+    _check_round_trips()
+    _benchmark()
@@ -0,0 +1,347 @@
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Python Demo: A Bit-Packed Boolean Array for Large Flag Columns
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# Usage:
+#   python Python/demos/Ch1BitArray.py                # examples + benchmark with 10^7 flags
+#   python Python/demos/Ch1BitArray.py 100000000      # benchmark with 10^8 flags (list[bool] needs ~800 MB)
+#
+# Section 1 of the cheat sheet notes that bool is a subclass of int. True and False are shared
+# singletons, so a list of a million flags holds a million 8-byte pointers to them: 8 bytes per flag.
+# A numpy bool_ array needs 1 byte per flag. BitArray stores 1 bit per flag, 64x less than a list.
+#
+# - Storage is a bytearray: bit i lives in byte i // 8 at bit position i % 8 ("little" bit order,
+#   the same as numpy's packbits(bitorder="little") and int.from_bytes(..., "little")).
+# - numpy views of that same bytearray (no copy) run AND/OR/XOR/NOT, popcount, search and conversions
+#   in C without any per-element Python loop. The logic operations and popcount use a uint64 view,
+#   so they process 64 flags per machine word.
+# - Element access returns True/False, so flags[i] behaves like int(True) == 1 in arithmetic,
+#   exactly like a bool taken from a list.
+
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+#===============================================================================
+# 1. Storage and Element Access
+#===============================================================================
+
+# The buffer is rounded up to whole 8-byte words so it can also be viewed as uint64.
+# Invariant: every bit past 'size' (the end of the last used byte and the padding bytes) is always 0.
+# count(), ==, to_bytes() and the searches can then work on whole bytes and words without masking,
+# and only the operations that could set those bits (NOT, fill=True, from_bytes) need to clear them.
+
+
+class BitArray:
+    __slots__ = ("_size", "_used", "_buf", "_np", "_words")
+
+    def __init__(self, size: int, fill: bool = False) -> None:
+        if size < 0:
+            raise ValueError("size must be non-negative")
+        self._size = size
+        self._used = (size + 7) // 8  # Bytes that hold flags; the rest of the buffer is padding.
+        length = (size + 63) // 64 * 8
+        self._buf = bytearray(b"\xff" * length if fill else length)
+        # Zero-copy views: writes through any of the three names are visible through the others.
+        # Pitfall: A bytearray with live buffer views cannot be resized, which is fine here since
+        # BitArray has a fixed size.
+        self._np = np.frombuffer(self._buf, dtype=np.uint8)
+        self._words = np.frombuffer(self._buf, dtype=np.uint64)
+        self._clear_padding()
+
+    def _clear_padding(self) -> None:
+        extra = self._size % 8
+        if extra:
+            self._buf[self._used - 1] &= (1 << extra) - 1
+        self._np[self._used:] = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> bool:
+        # Plain bytearray indexing is much faster than indexing the numpy view (which would return
+        # a numpy scalar rather than a Python bool). The bounds check is inlined on purpose: this is
+        # the hottest method when flags are read one at a time.
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("BitArray index out of range")
+        return bool(self._buf[index >> 3] >> (index & 7) & 1)
+
+    def __setitem__(self, index: int, value: bool) -> None:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("BitArray assignment index out of range")
+        if value:
+            self._buf[index >> 3] |= 1 << (index & 7)
+        else:
+            self._buf[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def __iter__(self) -> Iterator[bool]:
+        # Unpacks one chunk at a time so iterating 10^8 flags never materializes 10^8 bytes.
+        for start in range(0, self._used, _CHUNK_BYTES):
+            chunk = self._np[start:min(start + _CHUNK_BYTES, self._used)]
+            bits = np.unpackbits(chunk, count=min(len(chunk) * 8, self._size - start * 8), bitorder="little")
+            yield from bits.astype(bool).tolist()
+
+    def __repr__(self) -> str:
+        if self._size <= 64:
+            return f"BitArray('{''.join('1' if bit else '0' for bit in self)}')"
+        return f"BitArray(size={self._size}, count={self.count()})"
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buf)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self._buf.__sizeof__() + self._np.__sizeof__() + self._words.__sizeof__()
+
+    #===========================================================================
+    # 2. Vectorized Logic: AND, OR, XOR, NOT
+    #===========================================================================
+
+    # Each operator works on packed 64-bit words, so it touches size / 8 bytes instead of size objects.
+    # In-place forms (&=, |=, ^=) write into the existing buffer and allocate nothing.
+
+    def _check_same_size(self, other: "BitArray") -> None:
+        if not isinstance(other, BitArray):
+            raise TypeError(f"unsupported operand type: {type(other).__name__!r}")
+        if other._size != self._size:
+            raise ValueError(f"size mismatch: {self._size} vs {other._size}")
+
+    def _binary(self, other: "BitArray", ufunc: np.ufunc) -> "BitArray":
+        self._check_same_size(other)
+        result = BitArray(self._size)
+        ufunc(self._words, other._words, out=result._words)
+        return result
+
+    def _inplace(self, other: "BitArray", ufunc: np.ufunc) -> "BitArray":
+        self._check_same_size(other)
+        ufunc(self._words, other._words, out=self._words)
+        return self
+
+    def __and__(self, other: "BitArray") -> "BitArray":
+        return self._binary(other, np.bitwise_and)
+
+    def __or__(self, other: "BitArray") -> "BitArray":
+        return self._binary(other, np.bitwise_or)
+
+    def __xor__(self, other: "BitArray") -> "BitArray":
+        return self._binary(other, np.bitwise_xor)
+
+    def __iand__(self, other: "BitArray") -> "BitArray":
+        return self._inplace(other, np.bitwise_and)
+
+    def __ior__(self, other: "BitArray") -> "BitArray":
+        return self._inplace(other, np.bitwise_or)
+
+    def __ixor__(self, other: "BitArray") -> "BitArray":
+        return self._inplace(other, np.bitwise_xor)
+
+    def __invert__(self) -> "BitArray":
+        result = BitArray(self._size)
+        np.invert(self._words, out=result._words)
+        result._clear_padding()  # NOT turns the padding bits on; switch them back off.
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        return self._size == other._size and self._buf == other._buf
+
+    __hash__ = None  # Mutable, like list and bytearray.
+
+    def __reduce__(self):
+        # pickle, copy.copy and copy.deepcopy all go through here. Rebuilding from the packed bytes
+        # gives a new, independent buffer with fresh numpy views of it; the default protocol would
+        # copy _buf, _np and _words as three separate arrays that no longer share memory.
+        return (BitArray.from_bytes, (self.to_bytes(), self._size))
+
+    #===========================================================================
+    # 3. Counting and Searching
+    #===========================================================================
+
+    def count(self) -> int:
+        # Popcount of the whole array, one 64-bit word at a time (the padding bits are 0, so no
+        # masking is needed). np.bitwise_count maps to the CPU's popcount instruction.
+        if _HAS_BITWISE_COUNT:
+            return int(np.bitwise_count(self._words).sum(dtype=np.int64))
+        # numpy < 2.0: int.bit_count() (Python 3.10+) is also C-speed, after one copy of the buffer.
+        return int.from_bytes(self._buf, "little").bit_count()
+
+    def any(self) -> bool:
+        return bool(self._words.any())
+
+    def find_first(self, value: bool = True, start: int = 0) -> int:
+        # Index of the first bit equal to 'value' at or after 'start', or -1, like str.find().
+        # Whole bytes that cannot contain a match (0x00 when looking for True, 0xFF when looking for
+        # False) are skipped by numpy. The scan starts with a small window that doubles up to
+        # _CHUNK_BYTES, and argmax() stops at the first candidate byte, so a hit close to 'start'
+        # costs a few hundred bytes of work instead of a 64 KiB chunk.
+        if start < 0:
+            start = max(start + self._size, 0)
+        if start >= self._size:
+            return -1
+        skip = 0x00 if value else 0xFF
+        byte_index = start >> 3
+        byte = (self._buf[byte_index] ^ skip) & (0xFF << (start & 7))  # Ignore bits before 'start'.
+        window = _FIRST_WINDOW_BYTES
+        position = byte_index + 1
+        while not byte:
+            if position >= self._used:
+                return -1
+            candidates = self._np[position:min(position + window, self._used)] != skip
+            offset = int(candidates.argmax())  # Index of the first True, or 0 if there is none.
+            if candidates[offset]:
+                byte_index = position + offset
+                byte = self._buf[byte_index] ^ skip
+            position += len(candidates)
+            window = min(window * 2, _CHUNK_BYTES)
+        index = byte_index * 8 + ((byte & -byte).bit_length() - 1)  # Lowest set bit.
+        # When looking for False, the zero padding after the last flag reads as a match.
+        return index if index < self._size else -1
+
+    def iter_set_bits(self) -> Iterator[int]:
+        # Yields the indices of all True flags in increasing order. Only the non-zero bytes are
+        # unpacked, so sparse arrays (a few active users out of millions) are cheap to walk.
+        for chunk_start in range(0, self._used, _CHUNK_BYTES):
+            chunk = self._np[chunk_start:chunk_start + _CHUNK_BYTES]
+            nonzero = np.flatnonzero(chunk)
+            if not len(nonzero):
+                continue
+            bits = np.unpackbits(chunk[nonzero, None], axis=1, bitorder="little")
+            rows, columns = np.nonzero(bits)
+            yield from ((nonzero[rows] + chunk_start) * 8 + columns).tolist()
+
+    #===========================================================================
+    # 4. Conversions: numpy, bytes, iterables
+    #===========================================================================
+
+    @classmethod
+    def from_numpy(cls, flags: np.ndarray) -> "BitArray":
+        flat = np.asarray(flags, dtype=bool).ravel()
+        return cls.from_bytes(np.packbits(flat, bitorder="little"), len(flat))
+
+    def to_numpy(self) -> np.ndarray:
+        return np.unpackbits(self._np[:self._used], count=self._size, bitorder="little").view(bool)
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview, np.ndarray], size: Optional[int] = None) -> "BitArray":
+        # Inverse of to_bytes(). 'size' defaults to every bit of 'data'; bits past 'size' are dropped.
+        data = memoryview(data).cast("B")
+        if size is None:
+            size = len(data) * 8
+        if len(data) < (size + 7) // 8:
+            raise ValueError(f"{len(data)} bytes cannot hold {size} bits")
+        result = cls(size)
+        result._buf[:result._used] = data[:result._used]
+        result._clear_padding()
+        return result
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buf[:self._used])
+
+    @classmethod
+    def from_iterable(cls, flags: Iterable[bool]) -> "BitArray":
+        # Accepts a list[bool] (or any iterable of truthy values). np.fromiter does the loop in C.
+        return cls.from_numpy(np.fromiter(flags, dtype=bool))
+
+
+_CHUNK_BYTES = 1 << 16  # 64 KiB = 524,288 flags per chunk: large enough to amortize numpy calls.
+_FIRST_WINDOW_BYTES = 64  # find_first's first window: one cache line.
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")  # Added in numpy 2.0.
+
+
+#===============================================================================
+# 5. Examples and Benchmark
+#===============================================================================
+
+
+def _examples() -> None:
+    # Per-user status flags, as in the cheat sheet's ("Active" / "Inactive") details.
+    statuses = ["Active", "Inactive", "Active", "Active", "Inactive"]
+    active = BitArray.from_iterable(status == "Active" for status in statuses)
+    print(f"Active flags: {active}, count: {active.count()}")
+    print(f"active[0] + 1 = {active[0] + 1}  (a bool element behaves like int(True))")
+    print(f"Inactive (NOT): {~active}, first inactive user: {active.find_first(False)}")
+
+    premium = BitArray.from_iterable([True, True, False, False, False])
+    print(f"Active AND premium: {active & premium}, set bits: {list((active & premium).iter_set_bits())}")
+
+    round_trip = BitArray.from_numpy(active.to_numpy())
+    print(f"numpy round trip equal: {round_trip == active}, bytes: {active.to_bytes()!r}")
+
+    # Copies and pickles get their own buffer, with views that still share it.
+    import copy
+    import pickle
+
+    for clone in (copy.copy(active), copy.deepcopy(active), pickle.loads(pickle.dumps(active))):
+        clone[1] = True
+        assert clone.count() == active.count() + 1 and list(clone.iter_set_bits()) == [0, 1, 2, 3]
+        assert not active[1]
+    print("Copy and pickle checks passed.")
+
+
+def _benchmark(size: int) -> None:
+    import sys
+    import timeit
+
+    rng = np.random.default_rng(0)
+    np_a = rng.random(size) < 0.5
+    np_b = rng.random(size) < 0.5
+    bits_a = BitArray.from_numpy(np_a)
+    bits_b = BitArray.from_numpy(np_b)
+    sparse = BitArray(size)
+    for index in rng.choice(size, 1000, replace=False).tolist():
+        sparse[index] = True
+    list_a = np_a.tolist()
+    list_b = np_b.tolist()
+
+    assert bits_a.count() == int(np_a.sum()) and (bits_a & bits_b).to_numpy().tolist() == (np_a & np_b).tolist()
+
+    def best(statement) -> float:
+        return min(timeit.repeat(statement, number=1, repeat=3)) * 1000
+
+    print(f"\nBenchmark: {size:,} flags")
+    list_bytes = sys.getsizeof(list_a)  # Just the pointer array: True and False are shared singletons.
+    print(f"{'':<30} {'list[bool]':>12} {'numpy bool_':>12} {'BitArray':>12}")
+    print(f"{'Memory (MB)':<30} {list_bytes / 1e6:>12.1f} {np_a.nbytes / 1e6:>12.1f} {bits_a.nbytes / 1e6:>12.1f}")
+    print(f"{'AND (ms)':<30} {best(lambda: [x and y for x, y in zip(list_a, list_b)]):>12.1f} "
+          f"{best(lambda: np_a & np_b):>12.1f} {best(lambda: bits_a & bits_b):>12.1f}")
+    print(f"{'NOT (ms)':<30} {best(lambda: [not x for x in list_a]):>12.1f} "
+          f"{best(lambda: ~np_a):>12.1f} {best(lambda: ~bits_a):>12.1f}")
+    print(f"{'Popcount (ms)':<30} {best(lambda: sum(list_a)):>12.1f} "
+          f"{best(lambda: np.count_nonzero(np_a)):>12.1f} {best(bits_a.count):>12.1f}")
+    sparse_np = sparse.to_numpy()
+    sparse_list = sparse_np.tolist()
+    print(f"{'Set bits, sparse (ms)':<30} {best(lambda: [i for i, x in enumerate(sparse_list) if x]):>12.1f} "
+          f"{best(lambda: np.flatnonzero(sparse_np).tolist()):>12.1f} {best(lambda: list(sparse.iter_set_bits())):>12.1f}")
+    reads = range(min(size, 1_000_000))
+    print(f"{f'Element reads x{len(reads):,} (ms)':<30} {best(lambda: [list_a[i] for i in reads]):>12.1f} "
+          f"{best(lambda: [np_a[i] for i in reads]):>12.1f} {best(lambda: [bits_a[i] for i in reads]):>12.1f}")
+    sparse_hits = np.flatnonzero(sparse_np)
+    for start in rng.integers(0, size, 200).tolist():
+        later = sparse_hits[sparse_hits >= start]
+        assert sparse.find_first(True, start) == (int(later[0]) if len(later) else -1)
+        assert bits_a.find_first(False, start) == (start + int(np_a[start:].argmin()) if not np_a[start:].all() else -1)
+    # A hit a few hundred bytes after 'start' in dense data must not cost a 64 KiB chunk scan, which
+    # is what listing every candidate byte of the chunk (the obvious flatnonzero() approach) costs.
+    dense = BitArray.from_numpy(rng.random(4 * _CHUNK_BYTES * 8) < 0.5)
+    for index in range(4000):
+        dense[index] = False
+    near = min(timeit.repeat(lambda: dense.find_first(True, 5), number=1000, repeat=3)) * 1000  # us per call
+    chunk_scan = best(lambda: np.flatnonzero(dense._np[:_CHUNK_BYTES] != 0).tolist())
+    assert 4000 <= dense.find_first(True, 5) < 4016 and near / 1000 < chunk_scan / 10, (near, chunk_scan)
+    print(f"{'find_first, hit near start (us)':<30} {'':>12} {'':>12} {near:>12.1f}")
+    # Insight: The bulk operations touch 8x fewer bytes than numpy bool_ and are limited by memory
+    # bandwidth, so they keep pace with (or beat) numpy while using 1/8 of the memory. Single-element
+    # access is a Python method call and stays slower than list indexing; batch work through the
+    # vectorized methods, or convert with to_numpy() when a block of flags needs per-element logic.
+
+
+if __name__ == "__main__":
+    import sys
+
+    _examples()
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
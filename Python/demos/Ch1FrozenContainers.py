@@ -0,0 +1,270 @@
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Python Demo: Hashable Frozen Containers with Cached Hashes
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# Usage:
+#   python Python/demos/Ch1FrozenContainers.py       # examples + benchmark
+#
+# Section 3 of the cheat sheet shows that 'sample_dict[mutable_list]' raises a TypeError because
+# lists are not hashable, and section 10 notes that only immutable values can be set members.
+# The usual workaround is converting nested lists and dicts to tuples or frozensets on every use,
+# which rebuilds the key and recomputes its hash each time.
+#
+# This demo provides:
+# - freeze(value): converts nested lists/tuples, dicts and sets into FrozenList, FrozenDict and
+#   frozenset in a single recursive pass.
+# - FrozenList: an immutable tuple subclass that caches its hash. It compares equal to (and hashes
+#   like) the equivalent tuple, so it can look up keys that were stored as plain tuples.
+# - FrozenDict: an immutable mapping that caches its hash and compares equal to the equivalent dict.
+# - thaw(value): turns frozen values back into ordinary lists, dicts and sets.
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+#===============================================================================
+# 1. FrozenList
+#===============================================================================
+
+# Insight: CPython caches the hash of str and frozenset objects, but NOT of tuples. Hashing a tuple
+# walks (and hashes) every element again, so a large nested tuple used as a dict key pays that cost
+# on every lookup. FrozenList computes the tuple hash once, on first use, and keeps it.
+#
+# Subclassing tuple means indexing, slicing, iteration, len(), 'in' and comparisons all run at C
+# speed, and FrozenList((1, 2)) == (1, 2) is True with hash(FrozenList((1, 2))) == hash((1, 2)).
+# Pitfall: tuple subclasses cannot declare non-empty __slots__, so the cached hash lives in the
+# instance __dict__. That costs some memory per object; for tiny keys such as (1, 2) a plain tuple
+# is both smaller and faster, as the benchmark below shows.
+
+
+class FrozenList(tuple):
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            # The only writer of the cache: __setattr__ below rejects every assignment.
+            object.__setattr__(self, "_hash", tuple.__hash__(self))
+            return self._hash
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list(self)!r})"
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # As read-only as a tuple. This includes '_hash': a value assigned from outside would
+        # silently become the object's hash.
+        raise AttributeError(f"'FrozenList' object attribute '{name}' is read-only")
+
+    def __reduce__(self):
+        # Pickle only the items, never the cached hash: str hashes are randomized per process
+        # (PYTHONHASHSEED), so a hash computed here would be wrong after loading elsewhere.
+        return (FrozenList, (tuple(self),))
+
+    def thaw(self) -> list:
+        return [thaw(item) for item in self]
+
+
+#===============================================================================
+# 2. FrozenDict
+#===============================================================================
+
+# FrozenDict wraps a private dict instead of subclassing dict: a dict subclass could still be
+# changed through dict.__setitem__(frozen, key, value), which would silently break its cached hash.
+# __slots__ keeps each instance small (no per-object __dict__).
+#
+# The hash is hash(frozenset(items)), so it does not depend on insertion order, just like dict
+# equality ({'a': 1, 'b': 2} == {'b': 2, 'a': 1}).
+
+
+class FrozenDict(Mapping):
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        object.__setattr__(self, "_data", dict(*args, **kwargs))
+        object.__setattr__(self, "_hash", None)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(frozenset(self._data.items())))
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, FrozenDict):
+            # Two cached, different hashes prove inequality without comparing any items.
+            if self._hash is not None and other._hash is not None and self._hash != other._hash:
+                return False
+            return self._data == other._data
+        if isinstance(other, dict):
+            return self._data == other
+        return NotImplemented
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("'FrozenDict' object is immutable")
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({self._data!r})"
+
+    def __reduce__(self):
+        # Lets pickle and copy rebuild the object through __init__ (the slots are not picklable as-is).
+        return (FrozenDict, (self._data,))
+
+    def thaw(self) -> dict:
+        return {key: thaw(value) for key, value in self._data.items()}
+
+
+#===============================================================================
+# 3. freeze() and thaw()
+#===============================================================================
+
+# freeze() handles every container from the cheat sheet:
+#   list, tuple -> FrozenList      dict -> FrozenDict      set, frozenset -> frozenset
+# Subclasses (OrderedDict, defaultdict, a namedtuple) are frozen as their base type, like the binary
+# codec demo does: the exact-type checks come first because they are the fast, common case.
+# Pitfall: The subclass itself is not kept, so a namedtuple loses its field names and an OrderedDict
+# its order-sensitive equality, and thaw() returns a plain list or dict.
+# Values that are already frozen are returned unchanged, so freezing twice is cheap.
+# Anything else must already be hashable; an unhashable value (e.g. a bytearray) raises TypeError,
+# exactly like using it as a dict key would.
+# Note: Dict keys are frozen too, so {(1, 2): ...} and {[1, 2]: ...}-style data both work.
+# thaw() reverses freeze() for values, but leaves dict keys and set members frozen: they have to
+# stay hashable, so thaw({frozenset of FrozenList}) gives a set of FrozenList, not a set of lists.
+
+
+def freeze(value: Any) -> Any:
+    kind = type(value)
+    if kind is FrozenList or kind is FrozenDict:
+        return value
+    if kind is list or kind is tuple:
+        return FrozenList(freeze(item) for item in value)
+    if kind is dict:
+        return FrozenDict({freeze(key): freeze(item) for key, item in value.items()})
+    if kind is set or kind is frozenset:
+        return frozenset(freeze(item) for item in value)
+    # Slower path for subclasses: OrderedDict, defaultdict, namedtuple, a FrozenList subclass, ...
+    if isinstance(value, (FrozenList, FrozenDict)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return FrozenDict({freeze(key): freeze(item) for key, item in value.items()})
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    hash(value)  # Raises TypeError for unhashable values, e.g. bytearray.
+    return value
+
+
+def thaw(value: Any) -> Any:
+    kind = type(value)
+    if kind is FrozenList or kind is FrozenDict:
+        return value.thaw()
+    if kind is frozenset:
+        # Set members stay frozen, like FrozenDict keys: a thawed list or dict could not be a member.
+        return set(value)
+    return value
+
+
+#===============================================================================
+# 4. Examples
+#===============================================================================
+
+
+def _examples() -> None:
+    # The failing example from section 3, fixed by freezing the key.
+    sample_dict: Dict[Any, str] = {}
+    mutable_list = [4, 2, 3, 5]
+    try:
+        sample_dict[mutable_list] = "This will cause an error"
+    except TypeError as e:
+        print(f"Error with mutable key: {e}")
+    sample_dict[freeze(mutable_list)] = "This is allowed"
+    print(f"Frozen key lookup: {sample_dict[freeze(mutable_list)]}")
+
+    # Interchangeable with tuples: a key stored as a tuple is found with a FrozenList and vice versa.
+    sample_dict[(1, 2, 3)] = "stored as tuple"
+    print(f"Lookup by FrozenList: {sample_dict[FrozenList([1, 2, 3])]}")
+
+    # Deep freeze in one pass, then thaw back.
+    config = {"name": "Sabbir", "tags": ["python", "data"], "limits": {"max": [1, 2]}, "ids": {1, 2}}
+    frozen = freeze(config)
+    print(f"Frozen: {frozen!r}")
+    print(f"Hashable: {hash(frozen) == hash(freeze(config))}, equal to a fresh freeze: {frozen == freeze(config)}")
+    print(f"Equal to the equivalent dict: {FrozenDict(name='Sabbir', age=30) == {'name': 'Sabbir', 'age': 30}}")
+    # Pitfall: Equality is not deep across types. frozen == config is False, because the frozen
+    # 'tags' value is a FrozenList and a tuple never equals a list ((1, 2) == [1, 2] is False).
+    print(f"Thawed equals original: {thaw(frozen) == config}")
+    print(f"Thawed set of tuples: {thaw(freeze({'ids': {(1, 2)}}))}")
+
+    try:
+        frozen["tags"].append("oops")
+    except AttributeError as e:
+        print(f"Cannot modify: {e}")
+
+    # dict and list subclasses are frozen like their base types.
+    from collections import OrderedDict, defaultdict, namedtuple
+
+    Point = namedtuple("Point", "x y")
+    counts = defaultdict(list, {"a": [1]})
+    frozen_sub = freeze({"ordered": OrderedDict(b=[2]), "counts": counts, "point": Point([1], 2)})
+    print(f"Subclasses frozen: {frozen_sub!r}")
+    assert thaw(frozen_sub) == {"ordered": {"b": [2]}, "counts": {"a": [1]}, "point": [[1], 2]}
+
+    try:
+        freeze([bytearray(b"hello")])
+    except TypeError as e:
+        print(f"Unhashable leaf rejected: {e}")
+
+
+#===============================================================================
+# 5. Benchmark: Repeated-Key Lookups
+#===============================================================================
+
+
+def _to_tuple(value: Any) -> Any:
+    # The usual ad-hoc workaround: rebuild a nested tuple on every lookup.
+    if isinstance(value, list):
+        return tuple(_to_tuple(item) for item in value)
+    return value
+
+
+def _benchmark(lookups: int = 200_000) -> None:
+    import timeit
+
+    print(f"\nBenchmark: {lookups} lookups with the same key")
+    print(f"{'Key shape':<28} {'tuple() each use':>17} {'tuple reused':>13} {'FrozenList':>11}")
+    shapes = {
+        "small: [1, 2]": [1, 2],
+        "nested: 10 x [i, i+1]": [[i, i + 1] for i in range(10)],
+        "large: 200 x [i, str(i)]": [[i, str(i)] for i in range(200)],
+    }
+    for label, key in shapes.items():
+        tuple_key = _to_tuple(key)
+        frozen_key = freeze(key)
+        tuple_table = {tuple_key: "value"}
+        frozen_table = {frozen_key: "value"}
+        count = lookups if len(key) < 50 else lookups // 10
+        convert = min(timeit.repeat(lambda: tuple_table[_to_tuple(key)], number=count, repeat=3))
+        reused = min(timeit.repeat(lambda: tuple_table[tuple_key], number=count, repeat=3))
+        frozen = min(timeit.repeat(lambda: frozen_table[frozen_key], number=count, repeat=3))
+        per = 1e9 / count
+        print(f"{label:<28} {convert * per:>14.0f} ns {reused * per:>10.0f} ns {frozen * per:>8.0f} ns")
+    # Insight: Converting on every use is by far the slowest option: it rebuilds the key, hashes it and
+    # then compares it element by element with the stored key. Reusing a tuple avoids the rebuild and
+    # the comparison (dict lookups check identity first) but still rehashes it on every lookup, so its
+    # cost grows with the key's size, while a FrozenList lookup stays flat.
+    # For tiny keys the Python-level __hash__ call costs more than hashing two ints in C, so plain
+    # tuples remain the better choice there.
+
+
+if __name__ == "__main__":
+    _examples()
+    _benchmark()
@@ -0,0 +1,250 @@
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Python Demo: Incremental Re-Rendering of process_user_data Output
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# Usage:
+#   python Python/demos/Ch1IncrementalUserView.py              # example + benchmark on 10^6 users
+#   python Python/demos/Ch1IncrementalUserView.py 10000000     # benchmark on 10^7 users (needs a few GB of RAM)
+#
+# Section 8 of the cheat sheet defines process_user_data(usernames, details), which renders one line
+# per user: "Sabbir is 30 years old and Active". Each line depends only on that user's (age, status)
+# entry in 'details', so when a few thousand out of millions of entries change, re-running the
+# function over everyone repeats almost all of the work.
+#
+# This demo provides:
+# - TrackedDetails: a dict-like 'details' mapping that remembers which usernames were changed.
+# - IncrementalUserView: keeps the rendered lines keyed by username and, on refresh(), re-renders
+#   only the users whose details changed, returning a Delta of added, changed and removed lines.
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+Details = Tuple[int, str]
+
+#===============================================================================
+# 1. Rendering One User
+#===============================================================================
+
+# The same formatting and default as process_user_data in section 8 of the cheat sheet, for a single
+# user. Keep the two in sync: the benchmark below checks that the view matches the full function.
+MISSING_DETAILS: Details = (0, "Unknown")
+
+
+def render_user(username: str, details: "MutableMapping[str, Details]") -> str:
+    age, status = details.get(username, MISSING_DETAILS)
+    return f"{username} is {age} years old and {status}"
+
+
+def process_user_data(usernames: List[str], details: Dict[str, Details]) -> List[str]:
+    # Copy of the section 8 function (importing the cheat sheet would run all of its examples).
+    processed_users = []
+    for username in usernames:
+        age, status = details.get(username, (0, "Unknown"))
+        processed_users.append(f"{username} is {age} years old and {status}")
+    return processed_users
+
+
+#===============================================================================
+# 2. A Change-Tracking details Mapping
+#===============================================================================
+
+# Every write goes through __setitem__ / __delitem__, so those two methods are the only places that
+# need to record a change. MutableMapping supplies update(), pop(), setdefault() etc. on top of them,
+# and they all end up here too.
+# Insight: Assigning a value equal to the current one is not recorded. Bulk loaders often rewrite
+# unchanged rows, and skipping them keeps the dirty set (and the next refresh) small.
+# Pitfall: Reading and writing the wrapped dict directly (tracked._data[...] = ...) bypasses tracking.
+
+
+class TrackedDetails(MutableMapping):
+    def __init__(self, initial: Optional[Dict[str, Details]] = None) -> None:
+        self._data: Dict[str, Details] = dict(initial or {})
+        self._dirty: Set[str] = set()
+
+    def __getitem__(self, username: str) -> Details:
+        return self._data[username]
+
+    def __setitem__(self, username: str, value: Details) -> None:
+        if self._data.get(username) != value:
+            self._data[username] = value
+            self._dirty.add(username)
+
+    def __delitem__(self, username: str) -> None:
+        del self._data[username]
+        self._dirty.add(username)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, username: str, default: Optional[Details] = None) -> Optional[Details]:
+        # Faster than the MutableMapping default, which goes through __getitem__ and try/except.
+        return self._data.get(username, default)
+
+    def drain_changes(self) -> Set[str]:
+        # Returns the usernames changed since the last call and starts a new, empty change set.
+        changed, self._dirty = self._dirty, set()
+        return changed
+
+
+#===============================================================================
+# 3. The Incremental View
+#===============================================================================
+
+# 'lines' maps username -> rendered line. Dicts keep insertion order (Python 3.7+), so list(lines.values())
+# is in the same order as the original usernames list, with later additions at the end.
+# Pitfall: process_user_data renders a duplicated username twice; the view is keyed by username and
+# keeps one line per user.
+
+
+class Delta(NamedTuple):
+    added: Dict[str, str]  # username -> new line
+    changed: Dict[str, str]  # username -> new line
+    removed: Dict[str, str]  # username -> last line before removal
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class IncrementalUserView:
+    def __init__(self, usernames: Iterable[str], details: TrackedDetails) -> None:
+        self.details = details
+        details.drain_changes()  # Everything is rendered below, so older changes are already included.
+        self.lines: Dict[str, str] = {username: render_user(username, details) for username in usernames}
+        # username -> its line as of the last refresh (None if it was not shown), recorded the first
+        # time a user is touched. Comparing against it at refresh time nets out round trips such as
+        # remove + add, or a change that is undone before the next refresh.
+        self._before: Dict[str, Optional[str]] = {}
+
+    def add_user(self, username: str) -> None:
+        if username not in self.lines:
+            self._before.setdefault(username, None)
+            self.lines[username] = render_user(username, self.details)
+
+    def remove_user(self, username: str) -> None:
+        if username in self.lines:
+            self._before.setdefault(username, self.lines.pop(username))
+
+    def refresh(self) -> Delta:
+        # Work is proportional to the number of touched usernames, not to the number of users.
+        lines = self.lines
+        details = self.details
+        before = self._before
+        for username in details.drain_changes():
+            if username in lines:
+                before.setdefault(username, lines[username])
+
+        delta = Delta({}, {}, {})
+        for username, old in before.items():
+            if username in lines:
+                new = lines[username] = render_user(username, details)
+                if old is None:
+                    delta.added[username] = new
+                elif new != old:
+                    delta.changed[username] = new
+            elif old is not None:
+                delta.removed[username] = old
+        self._before = {}
+        return delta
+
+    def render(self) -> List[str]:
+        # The full output, as process_user_data would return it.
+        return list(self.lines.values())
+
+
+#===============================================================================
+# 4. Example and Benchmark
+#===============================================================================
+
+
+def _example() -> None:
+    details = TrackedDetails({"Sabbir": (30, "Active"), "Bob": (25, "Inactive")})
+    view = IncrementalUserView(["Sabbir", "Bob"], details)
+    print(view.render())  # ['Sabbir is 30 years old and Active', 'Bob is 25 years old and Inactive']
+
+    details["Bob"] = (26, "Active")
+    details["Sabbir"] = (30, "Active")  # Same value: not a change.
+    view.add_user("Charlie")  # No details yet: rendered with the (0, "Unknown") default.
+    print(view.refresh())
+    # Delta(added={'Charlie': 'Charlie is 0 years old and Unknown'}, changed={'Bob': 'Bob is 26 years old and Active'}, removed={})
+
+    del details["Bob"]
+    view.remove_user("Sabbir")
+    print(view.refresh())
+    # Delta(added={}, changed={'Bob': 'Bob is 0 years old and Unknown'}, removed={'Sabbir': 'Sabbir is 30 years old and Active'})
+
+
+def _benchmark(users: int, change_rate: float = 0.001, rounds: int = 5) -> None:
+    import random
+    import time
+
+    rng = random.Random(1)
+    statuses = ["Active", "Inactive"]
+    usernames = [f"user{i}" for i in range(users)]
+    plain = {username: (18 + i % 60, statuses[i % 2]) for i, username in enumerate(usernames)}
+    details = TrackedDetails(plain)
+
+    start = time.perf_counter()
+    view = IncrementalUserView(usernames, details)
+    initial = time.perf_counter() - start
+    changes = max(1, int(users * change_rate))
+    print(f"\nBenchmark: {users:,} users, {changes:,} changes per update ({change_rate:.1%}), {rounds} rounds")
+    print(f"Initial render: {initial:.2f} s")
+
+    full_times, incremental_times, plain_write_times, tracked_write_times = [], [], [], []
+    for _ in range(rounds):
+        updates = []
+        for username in rng.sample(usernames, changes):
+            age, status = plain[username]
+            updates.append((username, (age + 1, statuses[rng.random() < 0.5])))
+
+        # The same writes, once into the plain dict and once through TrackedDetails.__setitem__,
+        # so the tracking cost on the update path is measured too.
+        start = time.perf_counter()
+        for username, new in updates:
+            plain[username] = new
+        plain_write_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for username, new in updates:
+            details[username] = new
+        tracked_write_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        delta = view.refresh()
+        incremental_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        full = process_user_data(usernames, plain)
+        full_times.append(time.perf_counter() - start)
+
+        assert len(delta.changed) == changes
+        assert view.render() == full
+        del full
+
+    full_ms = min(full_times) * 1000
+    incremental_ms = min(incremental_times) * 1000
+    plain_write_ms = min(plain_write_times) * 1000
+    tracked_write_ms = min(tracked_write_times) * 1000
+    print(f"{'':<22} {'plain dict':>12} {'TrackedDetails':>15}")
+    print(f"{'Writes (ms)':<22} {plain_write_ms:>12.2f} {tracked_write_ms:>15.2f}  ({tracked_write_ms / plain_write_ms:.1f}x slower)")
+    print(f"{'Re-render (ms)':<22} {full_ms:>12.2f} {incremental_ms:>15.2f}  (full recomputation vs refresh)")
+    plain_total = plain_write_ms + full_ms
+    tracked_total = tracked_write_ms + incremental_ms
+    print(f"{'Writes + re-render':<22} {plain_total:>12.2f} {tracked_total:>15.2f}  ({plain_total / tracked_total:,.0f}x faster)")
+    # Pitfall: The tracking is paid on every write, refreshed or not: a Python-level __setitem__ with
+    # a get, a compare and a set.add costs several times a plain dict store. It pays off only when
+    # refreshes are frequent compared with the writes; a stream of millions of writes between rare
+    # refreshes can cost more than re-rendering everything once.
+    # Insight: The refresh also hands back exactly the lines that changed, so downstream consumers
+    # (a UI table, a cache, a message queue) can apply a few thousand updates instead of diffing
+    # millions of lines themselves.
+
+
+if __name__ == "__main__":
+    import sys
+
+    _example()
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,443 @@
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Python Demo: A Suffix Array Index for Bulk Substring Queries
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# Usage:
+#   python Python/demos/Ch1SuffixIndex.py                 # examples + benchmark on ~300 KB of log text
+#   python Python/demos/Ch1SuffixIndex.py 2000000         # benchmark on ~2 MB
+#
+# Section 7 of the cheat sheet indexes and slices 'text = "Python"'. On a six-character string,
+# 'in', str.find() and str.count() are instant, but each call scans the whole text: running
+# millions of queries over gigabytes of logs costs O(len(text)) per query.
+#
+# A suffix array lists the starting positions of all suffixes of the text in sorted order. Every
+# substring is a prefix of some suffix, so all occurrences of a pattern sit in one contiguous block
+# of the array, found by binary search in O(len(pattern) * log(len(text))) time.
+#
+# This demo provides:
+# - build_suffix_array(): SA-IS, a linear-time O(n) construction.
+# - build_lcp(): Kasai's O(n) longest-common-prefix array.
+# - SuffixIndex: count / locate / contains / prefix-range queries, plus save() and load() in a
+#   file format whose arrays are used straight from a memory-mapped file.
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+Text = Union[bytes, bytearray, memoryview, str]
+
+#===============================================================================
+# 1. Building the Suffix Array (SA-IS)
+#===============================================================================
+
+# SA-IS (Nong, Zhang & Chan, 2009) in short:
+# - Every suffix is S-type (smaller than the suffix after it) or L-type (larger).
+# - An LMS position is an S-type position whose left neighbour is L-type.
+# - Once the LMS suffixes are in sorted order, one left-to-right pass places all L-type suffixes and
+#   one right-to-left pass places all S-type suffixes ("induced sorting").
+# - The LMS suffixes are sorted by naming the LMS substrings and, if names repeat, solving the same
+#   problem recursively on a string at most half as long. Total work: O(n).
+#
+# The input is a list of ints in range(alphabet_size) ending with a unique, smallest sentinel 0.
+# Insight: Pure Python handles roughly a few hundred KB per second here. The algorithm is the one
+# used by production libraries (e.g. libsais), so porting this function to C or Cython keeps the
+# same structure and gains the usual 50-100x.
+
+
+def _sais(text: List[int], alphabet_size: int) -> List[int]:
+    n = len(text)
+    if n == 1:
+        return [0]
+
+    # Classify each position: True = S-type, False = L-type.
+    s_type = [False] * n
+    s_type[-1] = True
+    for i in range(n - 2, -1, -1):
+        s_type[i] = text[i] < text[i + 1] or (text[i] == text[i + 1] and s_type[i + 1])
+
+    def is_lms(i: int) -> bool:
+        return i > 0 and s_type[i] and not s_type[i - 1]
+
+    counts = [0] * alphabet_size
+    for c in text:
+        counts[c] += 1
+
+    def bucket_heads() -> List[int]:
+        heads, total = [0] * alphabet_size, 0
+        for c, count in enumerate(counts):
+            heads[c] = total
+            total += count
+        return heads
+
+    def bucket_tails() -> List[int]:
+        tails, total = [0] * alphabet_size, 0
+        for c, count in enumerate(counts):
+            total += count
+            tails[c] = total - 1
+        return tails
+
+    def induce(sorted_lms: List[int]) -> List[int]:
+        sa = [-1] * n
+        tails = bucket_tails()
+        for i in reversed(sorted_lms):
+            c = text[i]
+            sa[tails[c]] = i
+            tails[c] -= 1
+        heads = bucket_heads()
+        for j in range(n):
+            i = sa[j] - 1
+            if i >= 0 and not s_type[i]:
+                c = text[i]
+                sa[heads[c]] = i
+                heads[c] += 1
+        tails = bucket_tails()
+        for j in range(n - 1, -1, -1):
+            i = sa[j] - 1
+            if i >= 0 and s_type[i]:
+                c = text[i]
+                sa[tails[c]] = i
+                tails[c] -= 1
+        return sa
+
+    lms_positions = [i for i in range(1, n) if s_type[i] and not s_type[i - 1]]
+    sa = induce(lms_positions)
+
+    # Name the LMS substrings in their (now sorted) order; equal substrings share a name.
+    def same_lms_substring(a: int, b: int) -> bool:
+        k = 0
+        while True:
+            if text[a + k] != text[b + k] or s_type[a + k] != s_type[b + k]:
+                return False
+            if k > 0 and (is_lms(a + k) or is_lms(b + k)):
+                return is_lms(a + k) and is_lms(b + k)
+            k += 1
+
+    names = [-1] * n
+    name = -1
+    previous = -1
+    for i in sa:
+        if is_lms(i):
+            if previous < 0 or not same_lms_substring(previous, i):
+                name += 1
+            names[i] = name
+            previous = i
+
+    reduced = [names[i] for i in lms_positions]
+    if name + 1 < len(reduced):
+        reduced_sa = _sais(reduced, name + 1)
+    else:
+        # All names are unique, so the names already give the order.
+        reduced_sa = [0] * len(reduced)
+        for index, value in enumerate(reduced):
+            reduced_sa[value] = index
+    return induce([lms_positions[j] for j in reduced_sa])
+
+
+def build_suffix_array(data: bytes) -> array:
+    # Shift bytes up by one so 0 is free for the sentinel, then drop the sentinel's entry.
+    sa = _sais([b + 1 for b in data] + [0], 257)
+    # 'i' (4-byte) entries are enough below 2 GiB and halve the index size compared with 'q'.
+    return array("i" if len(data) < 2 ** 31 else "q", sa[1:])
+
+
+#===============================================================================
+# 2. The LCP Array (Kasai et al.)
+#===============================================================================
+
+# lcp[r] is the length of the longest common prefix of the suffixes at ranks r - 1 and r
+# (lcp[0] is 0). Kasai's trick: moving from suffix i to suffix i + 1 loses at most one character of
+# common prefix, so the running length 'h' decreases by at most 1 per step and the whole pass is O(n).
+# Uses: the longest repeated substring comes from max(lcp), and the number of distinct substrings is
+# n * (n + 1) / 2 - sum(lcp).
+
+
+def build_lcp(data: bytes, sa: array) -> array:
+    n = len(data)
+    rank = [0] * n
+    for r, i in enumerate(sa):
+        rank[i] = r
+    lcp = array(sa.typecode, bytes(n * sa.itemsize))
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa[r - 1]
+        while i + h < n and j + h < n and data[i + h] == data[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return lcp
+
+
+#===============================================================================
+# 3. Queries
+#===============================================================================
+
+# str input is encoded to UTF-8 and indexed as bytes. UTF-8 keeps code-point order, so sorting is
+# unchanged, and the bytes can be memory-mapped as-is.
+# Pitfall: Positions returned by locate() are BYTE offsets into the UTF-8 text. For ASCII logs they
+# equal str indices; for other text use data[:pos].decode("utf-8") or seek() in the file instead.
+
+
+def _as_bytes(value: Text) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else bytes(value)
+
+
+class SuffixIndex:
+    def __init__(self, data: Text, sa: Optional[array] = None, lcp: Optional[array] = None) -> None:
+        self.data = _as_bytes(data)
+        self._base = 0  # Offset of the text inside self.data (non-zero when loaded from a file).
+        self._end = len(self.data)  # Offset just past the text; a loaded file has more bytes after it.
+        self.sa = sa if sa is not None else build_suffix_array(self.data)
+        self.lcp = lcp if lcp is not None else build_lcp(self.data, self.sa)
+        self._mmap: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self.sa)
+
+    def prefix_range(self, pattern: Text) -> Tuple[int, int]:
+        # Returns (lo, hi): sa[lo:hi] are the positions of all suffixes that start with 'pattern'.
+        # Python 3.10+ 'key=' lets bisect compare text slices while the search loop itself runs in C.
+        needle = _as_bytes(pattern)
+        m = len(needle)
+        if m == 0:
+            return 0, len(self.sa)
+        data, base, end = self.data, self._base, self._end
+
+        def key(i: int) -> bytes:
+            # Clamp to the end of the text: in a loaded file the padding and SA bytes follow it,
+            # and reading into them would both invent matches and break the sorted order.
+            return data[base + i:min(base + i + m, end)]
+
+        lo = bisect_left(self.sa, needle, key=key)
+        hi = bisect_right(self.sa, needle, lo=lo, key=key)
+        return lo, hi
+
+    def count(self, pattern: Text) -> int:
+        lo, hi = self.prefix_range(pattern)
+        return hi - lo
+
+    def contains(self, pattern: Text) -> bool:
+        lo, hi = self.prefix_range(pattern)
+        return hi > lo
+
+    def locate(self, pattern: Text, limit: Optional[int] = None) -> List[int]:
+        # Occurrences in text order. 'limit' caps how many are returned (the first ones in suffix
+        # order, i.e. not necessarily the leftmost) so a very common pattern cannot flood the caller.
+        lo, hi = self.prefix_range(pattern)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return sorted(self.sa[lo:hi])
+
+    def longest_repeat(self) -> bytes:
+        # The longest substring that occurs at least twice, straight from the LCP array.
+        if len(self.lcp) < 2:
+            return b""
+        length = max(self.lcp)
+        rank = list(self.lcp).index(length)
+        start = self._base + self.sa[rank]
+        return bytes(self.data[start:start + length])
+
+    #===========================================================================
+    # 4. Persistence (memory-mappable)
+    #===========================================================================
+
+    # File layout (all little-endian):
+    #   header: magic b"CH1SA", version (1 byte), item size (1 byte: 4 or 8), padding, n (8 bytes)
+    #   text:   n bytes, then zero padding up to a multiple of 8
+    #   sa:     n items of 'item size' bytes
+    #   lcp:    n items of 'item size' bytes
+    # load() maps the file and wraps the arrays in memoryviews, so opening a multi-GB index costs
+    # almost nothing: the OS pages data in as queries touch it, and several processes share the pages.
+    # Pitfall: array.array and memoryview.cast() use native byte order, so both save() and load() refuse
+    # to run on a big-endian machine instead of silently writing or reading swapped positions.
+
+    HEADER = struct.Struct("<5sBBxQ")
+    MAGIC = b"CH1SA"
+    VERSION = 1
+
+    def save(self, path: Union[str, Path]) -> int:
+        # Returns the number of bytes written.
+        if sys.byteorder != "little":
+            raise ValueError("the index file format is little-endian only")
+        n = len(self.sa)
+        text = self.data[self._base:self._base + n]
+        padding = -n % 8
+        with open(path, "wb") as fp:
+            fp.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.sa.itemsize, n))
+            fp.write(text)
+            fp.write(b"\0" * padding)
+            fp.write(memoryview(self.sa).cast("B"))
+            fp.write(memoryview(self.lcp).cast("B"))
+            return fp.tell()
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SuffixIndex":
+        if sys.byteorder != "little":
+            raise ValueError("the index file format is little-endian only")
+        with open(path, "rb") as fp:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, itemsize, n = cls.HEADER.unpack_from(mapped, 0)
+        if magic != cls.MAGIC or version != cls.VERSION or itemsize not in (4, 8):
+            mapped.close()
+            raise ValueError(f"{path}: not a version {cls.VERSION} suffix index file")
+        text_start = cls.HEADER.size
+        sa_start = text_start + n + (-n % 8)
+        lcp_start = sa_start + n * itemsize
+        if len(mapped) < lcp_start + n * itemsize:
+            mapped.close()
+            raise ValueError(f"{path}: file is truncated")
+        typecode = "i" if itemsize == 4 else "q"
+        view = memoryview(mapped)
+        index = cls.__new__(cls)
+        index.data = mapped  # Slicing an mmap returns bytes, exactly what prefix_range() compares.
+        index._base = text_start
+        index._end = text_start + n
+        index.sa = view[sa_start:lcp_start].cast(typecode)
+        index.lcp = view[lcp_start:lcp_start + n * itemsize].cast(typecode)
+        index._mmap = mapped
+        return index
+
+    def close(self) -> None:
+        # Release the memoryviews before closing the map; mmap.close() fails while views exist.
+        if self._mmap is not None:
+            self.sa.release()
+            self.lcp.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "SuffixIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+#===============================================================================
+# 5. Examples and Benchmark
+#===============================================================================
+
+
+def _naive_suffix_array(data: bytes) -> List[int]:
+    # O(n^2 log n) reference implementation, only for checking small inputs.
+    return sorted(range(len(data)), key=lambda i: data[i:])
+
+
+def _examples() -> None:
+    text = "Python"
+    index = SuffixIndex(text)
+    print(f"Suffixes of {text!r} in sorted order: {[text[i:] for i in index.sa]}")
+    print(f"count('y'): {index.count('y')}, contains('tho'): {index.contains('tho')}, locate('on'): {index.locate('on')}")
+
+    banana = SuffixIndex("banana")
+    print(f"'banana': locate('ana') = {banana.locate('ana')}, longest repeat = {banana.longest_repeat()!r}")
+
+    # Cross-check SA-IS and Kasai against brute force on many small strings.
+    import random
+
+    rng = random.Random(7)
+    for _ in range(300):
+        data = bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 40)))
+        sa = build_suffix_array(data)
+        assert list(sa) == _naive_suffix_array(data), data
+        lcp = build_lcp(data, sa)
+        for r in range(1, len(data)):
+            a, b = data[sa[r - 1]:], data[sa[r]:]
+            assert lcp[r] == next((k for k in range(min(len(a), len(b))) if a[k] != b[k]), min(len(a), len(b)))
+    print("SA-IS and LCP checks passed.")
+
+    # A loaded index must answer exactly like the in-memory one. Lengths that are a multiple of 8
+    # leave no padding after the text, so suffixes near the end sit right next to the SA bytes.
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "check.sa")
+        for _ in range(100):
+            data = bytes(rng.choice(b"ab\n") for _ in range(8 * rng.randint(1, 5)))
+            index = SuffixIndex(data)
+            index.save(path)
+            with SuffixIndex.load(path) as loaded:
+                for length in range(1, 4):
+                    for start in range(len(data)):
+                        for pattern in (data[start:start + length], data[start:start + length - 1] + b"\x07"):
+                            assert loaded.locate(pattern) == index.locate(pattern) == _find_all(data, pattern), (data, pattern)
+    print("Saved/loaded index checks passed.")
+
+
+def _sample_logs(size: int) -> bytes:
+    import random
+
+    rng = random.Random(42)
+    levels = ["INFO", "INFO", "INFO", "WARN", "ERROR", "DEBUG"]
+    messages = ["user login", "user logout", "cache miss", "cache hit", "timeout talking to db", "request served"]
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i * 7 % 60:02d} {rng.choice(levels)} user{rng.randint(1, 5000)} {rng.choice(messages)} latency={rng.randint(1, 999)}ms\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines).encode("ascii")
+
+
+def _benchmark(size: int) -> None:
+    import os
+    import tempfile
+    import time
+    import timeit
+
+    data = _sample_logs(size)
+    print(f"\nBenchmark: {len(data):,} bytes of log text")
+
+    start = time.perf_counter()
+    index = SuffixIndex(data)
+    build = time.perf_counter() - start
+    print(f"Build (SA-IS + LCP): {build:.2f} s ({len(data) / build / 1e6:.2f} MB/s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "logs.sa")
+        size_on_disk = index.save(path)
+        print(f"Index file: {size_on_disk:,} bytes ({size_on_disk / len(data):.1f}x the text)")
+        start = time.perf_counter()
+        with SuffixIndex.load(path) as mapped:
+            print(f"Load via mmap: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+            patterns = [b"ERROR", b"user4242 ", b"timeout talking", b"latency=999ms", b"no such text"]
+            for pattern in patterns:
+                assert mapped.count(pattern) == data.count(pattern)
+                assert mapped.locate(pattern) == _find_all(data, pattern)
+
+            number = 200
+            print(f"{'Pattern':<20} {'Hits':>7} {'Index q/s':>11} {'find() loop q/s':>16} {'count() q/s':>12}")
+            for pattern in patterns:
+                indexed = min(timeit.repeat(lambda: mapped.locate(pattern), number=number, repeat=3)) / number
+                scanned = min(timeit.repeat(lambda: _find_all(data, pattern), number=2, repeat=3)) / 2
+                counted = min(timeit.repeat(lambda: data.count(pattern), number=20, repeat=3)) / 20
+                print(f"{pattern.decode():<20} {mapped.count(pattern):>7} {1 / indexed:>11,.0f} {1 / scanned:>16,.0f} {1 / counted:>12,.0f}")
+    # Insight: The index answers in time that depends on the pattern and the number of hits, not on the
+    # text size, so its lead over scanning grows linearly with the amount of text. The price is the
+    # build time and roughly 9x the text size on disk (4-byte SA and LCP entries per text byte).
+
+
+def _find_all(data: bytes, pattern: bytes) -> List[int]:
+    # The baseline: repeated find() calls, i.e. a full scan of the text per query.
+    positions = []
+    pos = data.find(pattern)
+    while pos != -1:
+        positions.append(pos)
+        pos = data.find(pattern, pos + 1)
+    return positions
+
+
+if __name__ == "__main__":
+    _examples()
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)